@@ -1,37 +1,130 @@
 import os
 import sys
+import argparse
 import json
 import time
+import hashlib
+import mmap
+import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import subprocess
-from bs4 import BeautifulSoup
+import asyncio
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urljoin
 from typing import List, Dict, Optional
 
+try:
+    import aiohttp
+except ImportError:  # Fallback ke requests serial jika aiohttp tidak terpasang
+    aiohttp = None
+
+try:
+    from yt_dlp import YoutubeDL
+except ImportError:
+    YoutubeDL = None
+
+try:
+    import orjson
+except ImportError:  # Fallback ke json bawaan jika orjson tidak terpasang
+    orjson = None
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:  # Fallback ke parser bawaan jika lxml tidak terpasang
+    HTML_PARSER = 'html.parser'
+
 # Konfigurasi
 BASE_URL = "https://20.detik.com/detikupdate"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 CHECK_INTERVAL = 7200  # 1 jam
-DATA_FILE = "posted_videos.json"
+DATA_FILE = "posted_videos.jsonl"
+LEGACY_DATA_FILE = "posted_videos.json"  # Format lama (list JSON), dimigrasi otomatis
 DOWNLOAD_DIR = "downloaded_videos"
 FB_PAGES_FILE = "facebook_pages.json"
 MAX_RETRIES = 3
-UPLOAD_DELAY = 30  # Delay antar upload ke page berbeda
+MAX_CONCURRENT_FETCHES = 10  # Batas koneksi paralel ke Detik
+TOKEN_CACHE_TTL = CHECK_INTERVAL  # Token yang valid tidak dicek ulang selama ini (detik)
+GRAPH_POOL_SIZE = 32  # Koneksi keep-alive ke Graph API = batas upload paralel
+UPLOAD_CHUNK_SIZE = 8 << 20  # 8 MB per chunk upload Reel
+UPLOAD_TIMEOUT = (10, 120)  # (connect, read) detik; koneksi macet jadi Timeout yang di-retry
+HASH_CHUNK_SIZE = 1 << 20  # 1 MB per blok saat hashing file video
+FFMPEG_THREADS = 4  # Thread per proses FFmpeg
+MAX_PARALLEL_CONVERSIONS = max(1, (os.cpu_count() or 1) // FFMPEG_THREADS)
+PREFER_HWENC = True  # Pakai encoder GPU (NVENC/QSV/VAAPI) jika tersedia, fallback ke libx264
 
 os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
+def json_loads(data):
+    """Parse JSON from str or bytes"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+def build_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive session with connection pooling and retries"""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # POST tidak di-retry (default urllib3) agar upload tidak terkirim dua kali
+        max_retries=Retry(total=MAX_RETRIES, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Session dipakai bersama agar koneksi TCP/TLS dipakai ulang antar video dan page.
+# Token dikirim per request, jadi state session tidak pernah diubah setelah ini.
+GRAPH_SESSION = build_session(GRAPH_POOL_SIZE)
+DETIK_SESSION = build_session(MAX_CONCURRENT_FETCHES)
+
+# (page_id, access_token) -> waktu validasi token terakhir yang berhasil
+_TOKEN_CACHE: Dict[tuple, float] = {}
+
+# Hanya tag yang dipakai yang di-parse
+LISTING_STRAINER = SoupStrainer('article')
+DETAIL_STRAINER = SoupStrainer(['h1', 'title', 'div', 'meta'])
+
+# Pola ekstraksi URL video (dikompilasi sekali)
+JSONLD_RE = re.compile(r'<script type="application/ld\+json">(.*?)</script>', re.DOTALL)
+
+# Semua pola digabung agar HTML cukup dipindai sekali; urutan = prioritas
+VIDEO_URL_GROUPS = ('m3u8', 'mp4meta', 'mp4src')
+VIDEO_URL_RE = re.compile(
+    r'videoUrl\s*:\s*["\'](?P<m3u8>.*?\.m3u8[^"\']*)["\']'
+    r'|<meta[^>]*content=["\'](?P<mp4meta>https?://[^"\']*\.mp4[^"\']*)["\']'
+    r'|src:\s*["\'](?P<mp4src>https?://[^"\']*\.mp4[^"\']*)["\']',
+    re.IGNORECASE
+)
+
 class FacebookPageManager:
+    _cache = None  # (mtime, pages) dari load terakhir
+
     @staticmethod
     def load_pages() -> List[Dict]:
-        """Load Facebook pages configuration from JSON file"""
+        """Load Facebook pages configuration from JSON file, reusing it while unchanged"""
         if not os.path.exists(FB_PAGES_FILE):
             raise FileNotFoundError(f"Facebook pages config file not found: {FB_PAGES_FILE}")
+        
+        mtime = os.stat(FB_PAGES_FILE).st_mtime
+        if FacebookPageManager._cache and FacebookPageManager._cache[0] == mtime:
+            return FacebookPageManager._cache[1]
             
         try:
-            with open(FB_PAGES_FILE, 'r') as f:
-                pages = json.load(f)
+            with open(FB_PAGES_FILE, 'rb') as f:
+                pages = json_loads(f.read())
                 if not isinstance(pages, list):
                     raise ValueError("Invalid Facebook pages config format - expected list")
                 
@@ -42,6 +135,7 @@ class FacebookPageManager:
                         if field not in page:
                             raise ValueError(f"Missing required field '{field}' in page config")
                 
+                FacebookPageManager._cache = (mtime, pages)
                 return pages
         except Exception as e:
             raise Exception(f"Error loading Facebook pages config: {e}")
@@ -50,100 +144,379 @@ class VideoManager:
     def __init__(self):
         self.data_file = DATA_FILE
         self.posted_videos = self.load_posted_videos()
+        # Index page_url dan source_url -> video untuk lookup O(1)
+        self._index: Dict[str, Dict] = {}
+        for video in self.posted_videos:
+            self._index_video(video)
+        # Hash konten untuk deteksi video sama yang dipublish ulang di URL lain
+        self._hashes = {video['content_hash'] for video in self.posted_videos if video.get('content_hash')}
 
     def load_posted_videos(self) -> List[Dict]:
-        """Load posted videos from JSON file"""
+        """Load posted videos from JSON Lines file"""
+        self.migrate_legacy_file()
         if not os.path.exists(self.data_file):
             return []
             
+        videos = []
         try:
-            with open(self.data_file, 'r') as f:
-                if os.stat(self.data_file).st_size == 0:
-                    return []                
-                return json.load(f)
+            with open(self.data_file, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # Baris rusak (mis. terpotong saat crash) dilewati, bukan membuang semua
+                    try:
+                        videos.append(json_loads(line))
+                    except ValueError as e:
+                        print(f"Skipping malformed line {line_no} in {self.data_file}: {e}")
         except Exception as e:
             print(f"Error loading posted videos: {e}")
-            return []
+        return videos
+
+    def migrate_legacy_file(self):
+        """Convert old list-based JSON file to JSON Lines once"""
+        if os.path.exists(self.data_file) or not os.path.exists(LEGACY_DATA_FILE):
+            return
+            
+        try:
+            with open(LEGACY_DATA_FILE, 'rb') as f:
+                if os.stat(LEGACY_DATA_FILE).st_size == 0:
+                    return
+                videos = json_loads(f.read())
+            if self.save_posted_videos(videos):
+                print(f"Migrated {len(videos)} posted videos from {LEGACY_DATA_FILE} to {self.data_file}")
+        except Exception as e:
+            print(f"Error migrating posted videos: {e}")
 
-    def save_posted_videos(self):
-        """Save posted videos to JSON file"""
+    def save_posted_videos(self, videos: List[Dict]) -> bool:
+        """Rewrite the whole JSON Lines file atomically, returning True on success"""
+        tmp_file = self.data_file + '.tmp'
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.posted_videos, f, indent=2)
+            with open(tmp_file, 'wb') as f:
+                for video in videos:
+                    f.write(json_dumps(video) + b'\n')
+            os.replace(tmp_file, self.data_file)
+            return True
         except Exception as e:
             print(f"Error saving posted videos: {e}")
+            return False
+
+    def append_posted_video(self, video_details: Dict):
+        """Append a single video to the JSON Lines file"""
+        try:
+            with open(self.data_file, 'a+b') as f:
+                # Tutup dulu baris terakhir yang terpotong agar record baru tidak menempel
+                prefix = b''
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        prefix = b'\n'
+                f.write(prefix + json_dumps(video_details) + b'\n')
+        except Exception as e:
+            print(f"Error saving posted video: {e}")
+
+    def _index_video(self, video: Dict):
+        """Register a video under its listing page link and its media URL"""
+        for key in ('page_url', 'source_url'):
+            if url := video.get(key):
+                self._index[url] = video
 
     def is_video_posted(self, video_url: str) -> bool:
-        """Check if video has already been posted"""
-        return any(video.get('source_url') == video_url for video in self.posted_videos)
+        """Check if video has already been posted, by page link or media URL"""
+        return video_url in self._index
+        
+    def is_content_posted(self, content_hash: str) -> bool:
+        """Check if a video with the same content hash has already been posted"""
+        return content_hash in self._hashes
         
     def add_posted_video(self, video_details: Dict):
         """Add new video to posted videos list"""
         if not self.is_video_posted(video_details['source_url']):
             self.posted_videos.append(video_details)
-            self.save_posted_videos()
+            self._index_video(video_details)
+            if content_hash := video_details.get('content_hash'):
+                self._hashes.add(content_hash)
+            self.append_posted_video(video_details)
 
     def clean_downloads(self):
         """Remove all downloaded video files"""
-        for filename in os.listdir(DOWNLOAD_DIR):
-            file_path = os.path.join(DOWNLOAD_DIR, filename)
-            try:
-                if os.path.isfile(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                print(f"Error deleting file {filename}: {e}")
+        with os.scandir(DOWNLOAD_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        os.unlink(entry.path)
+                except Exception as e:
+                    print(f"Error deleting file {entry.name}: {e}")
 
 class VideoProcessor:
+    YDL_OPTS = {
+        'format': 'bestvideo[height<=1080]+bestaudio/best',
+        'outtmpl': os.path.join(DOWNLOAD_DIR, '%(id)s.%(ext)s'),
+        'merge_output_format': 'mp4',
+        'quiet': True,
+        'no_warnings': True,
+    }
+
     @staticmethod
-    def download_video(video_url: str) -> Optional[str]:
-        """Download video using yt-dlp"""
-        try:
-            import yt_dlp
-            
-            ydl_opts = {
-                'format': 'bestvideo[height<=1080]+bestaudio/best',
-                'outtmpl': os.path.join(DOWNLOAD_DIR, '%(id)s.%(ext)s'),
-                'merge_output_format': 'mp4',
-                'quiet': True,
-                'no_warnings': True,
-            }
+    @lru_cache(maxsize=None)
+    def _get_ydl(as_reel: bool):
+        """Create the YoutubeDL instance for a download mode once and reuse it"""
+        ydl_opts = dict(VideoProcessor.YDL_OPTS)
+        if as_reel:
+            # yt-dlp menyerahkan stream ke FFmpeg yang langsung encode ke format Reel,
+            # tanpa MP4 perantara. Butuh satu format gabungan (tanpa merge).
+            encoder = VideoProcessor.get_encoder()
+            ydl_opts.update({
+                'format': 'best[height<=1080]/best',
+                'outtmpl': os.path.join(DOWNLOAD_DIR, 'reel_%(id)s.mp4'),
+                'external_downloader': {'default': 'ffmpeg'},
+                'external_downloader_args': {
+                    'ffmpeg_i': [
+                        *encoder['global_args'],
+                        *encoder['input_args'],
+                        '-err_detect', 'ignore_err'
+                    ],
+                    'ffmpeg_o': [
+                        '-vf', VideoProcessor.REEL_FILTER + encoder['filter_suffix'],
+                        *encoder['video_args'],
+                        '-threads', str(FFMPEG_THREADS),
+                        *VideoProcessor.REEL_AUDIO_ARGS
+                    ],
+                },
+            })
+        return YoutubeDL(ydl_opts)
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=True)
-                return ydl.prepare_filename(info)
+    @staticmethod
+    def download_video(video_url: str, as_reel: bool = False) -> Optional[str]:
+        """Download video using yt-dlp, encoding straight to Reels format if as_reel"""
+        if YoutubeDL is None:
+            print("Download error: yt-dlp is not installed")
+            return None
+        
+        try:
+            ydl = VideoProcessor._get_ydl(as_reel)
+            info = ydl.extract_info(video_url, download=True)
+            return ydl.prepare_filename(info)
 
         except Exception as e:
             print(f"Download error: {e}")
             return None
 
     @staticmethod
-    def convert_to_reel_format(input_path: str) -> Optional[str]:
-        """Convert video to Reels format using FFmpeg"""
-        output_path = os.path.join(DOWNLOAD_DIR, "reel_" + os.path.basename(input_path))
+    def compute_file_hash(path: str) -> str:
+        """Compute SHA-256 hex digest of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    REEL_FILTER = 'scale=720:1280:force_original_aspect_ratio=decrease,pad=720:1280:(ow-iw)/2:(oh-ih)/2,setsar=1'
+    REEL_AUDIO_ARGS = [
+        '-c:a', 'aac',
+        '-b:a', '128k',
+        '-movflags', '+faststart',
+        '-f', 'mp4',
+    ]
+    CPU_ENCODER = {
+        'name': 'libx264',
+        'global_args': [],
+        'input_args': [],
+        'filter_suffix': '',
+        'video_args': ['-c:v', 'libx264', '-preset', 'fast', '-crf', '23'],
+    }
+    # Urutan = prioritas; scaling tetap di CPU agar filter sama untuk semua encoder
+    HW_ENCODERS = [
+        {
+            'name': 'h264_nvenc',
+            'global_args': [],
+            'input_args': ['-hwaccel', 'cuda'],
+            'filter_suffix': '',
+            'video_args': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-b:v', '3M'],
+        },
+        {
+            'name': 'h264_qsv',
+            'global_args': [],
+            'input_args': [],
+            'filter_suffix': '',
+            'video_args': ['-c:v', 'h264_qsv', '-preset', 'fast', '-b:v', '3M'],
+        },
+        {
+            'name': 'h264_vaapi',
+            'global_args': ['-vaapi_device', '/dev/dri/renderD128'],
+            'input_args': [],
+            'filter_suffix': ',format=nv12,hwupload',
+            'video_args': ['-c:v', 'h264_vaapi', '-b:v', '3M'],
+        },
+    ]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_encoder() -> Dict:
+        """Pick the first working hardware H.264 encoder, or libx264"""
+        if not PREFER_HWENC:
+            return VideoProcessor.CPU_ENCODER
+        
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], check=True, capture_output=True)
+            available = result.stdout.decode()
+        except Exception as e:
+            print(f"FFmpeg encoder probe failed: {e}")
+            return VideoProcessor.CPU_ENCODER
         
-        cmd = [
-            'ffmpeg',
-            '-i', input_path,
-            '-vf', 'scale=720:1280:force_original_aspect_ratio=decrease,pad=720:1280:(ow-iw)/2:(oh-ih)/2,setsar=1',
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-movflags', '+faststart',
-            '-f', 'mp4',
-            output_path
-        ]
+        for encoder in VideoProcessor.HW_ENCODERS:
+            if encoder['name'] not in available:
+                continue
+            # Encoder bisa terdaftar walau GPU tidak ada, jadi uji encode singkat
+            cmd = [
+                'ffmpeg', '-y', '-nostdin', '-hide_banner', '-v', 'error',
+                *encoder['global_args'],
+                '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                '-vf', 'null' + encoder['filter_suffix'],
+                *encoder['video_args'],
+                '-f', 'null', '-'
+            ]
+            try:
+                subprocess.run(cmd, check=True, capture_output=True)
+                print(f"Using hardware encoder: {encoder['name']}")
+                return encoder
+            except Exception:
+                continue
         
+        return VideoProcessor.CPU_ENCODER
+
+    @staticmethod
+    def _reel_output_path(input_path: str) -> str:
+        """Path of the converted Reel for a downloaded video"""
+        return os.path.join(DOWNLOAD_DIR, "reel_" + os.path.basename(input_path))
+
+    @staticmethod
+    def _build_reel_cmd(input_paths: List[str], output_paths: List[str], encoder: Dict) -> List[str]:
+        """Build one FFmpeg command converting every input to its Reel output"""
+        # -y/-nostdin: output sisa run gagal tidak boleh memicu prompt overwrite
+        cmd = ['ffmpeg', '-y', '-nostdin', *encoder['global_args']]
+        for path in input_paths:
+            cmd += [*encoder['input_args'], '-i', path]
+        cmd += ['-filter_complex', ';'.join(
+            f'[{i}:v]{VideoProcessor.REEL_FILTER}{encoder["filter_suffix"]}[v{i}]'
+            for i in range(len(input_paths))
+        )]
+        for i, output_path in enumerate(output_paths):
+            cmd += [
+                '-map', f'[v{i}]', '-map', f'{i}:a?',
+                *encoder['video_args'],
+                '-threads', str(FFMPEG_THREADS),
+                *VideoProcessor.REEL_AUDIO_ARGS,
+                output_path
+            ]
+        return cmd
+
+    @staticmethod
+    def _run_ffmpeg(cmd: List[str]) -> bool:
+        """Run an FFmpeg command, returning True on success"""
         try:
             subprocess.run(cmd, check=True, capture_output=True)
-            return output_path
+            return True
         except subprocess.CalledProcessError as e:
             print(f"FFmpeg conversion failed: {e.stderr.decode()}")
-            return None
+            return False
         except Exception as e:
             print(f"Error in video conversion: {e}")
-            return None
+            return False
+
+    @staticmethod
+    def _convert(input_paths: List[str]) -> bool:
+        """Run one FFmpeg conversion, retrying on CPU if the hardware encoder fails"""
+        output_paths = [VideoProcessor._reel_output_path(path) for path in input_paths]
+        encoder = VideoProcessor.get_encoder()
+        if VideoProcessor._run_ffmpeg(VideoProcessor._build_reel_cmd(input_paths, output_paths, encoder)):
+            return True
+        if encoder is VideoProcessor.CPU_ENCODER:
+            return False
+        
+        print(f"{encoder['name']} failed, retrying with libx264...")
+        for output_path in output_paths:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        return VideoProcessor._run_ffmpeg(
+            VideoProcessor._build_reel_cmd(input_paths, output_paths, VideoProcessor.CPU_ENCODER)
+        )
+
+    @staticmethod
+    def convert_to_reel_format(input_path: str) -> Optional[str]:
+        """Convert video to Reels format using FFmpeg"""
+        if VideoProcessor._convert([input_path]):
+            return VideoProcessor._reel_output_path(input_path)
+        return None
+
+    @staticmethod
+    def convert_batch_to_reel_format(input_paths: List[str]) -> List[Optional[str]]:
+        """Convert several videos to Reels format with a single FFmpeg process"""
+        if len(input_paths) < 2:
+            return [VideoProcessor.convert_to_reel_format(path) for path in input_paths]
+        
+        output_paths = [VideoProcessor._reel_output_path(path) for path in input_paths]
+        if VideoProcessor._convert(input_paths):
+            return output_paths
+        
+        # Satu input rusak menggagalkan seluruh batch, ulangi per file
+        print("Batch conversion failed, falling back to per-file conversion...")
+        for output_path in output_paths:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        return [VideoProcessor.convert_to_reel_format(path) for path in input_paths]
+
+class MultipartFileStream:
+    """File-like multipart/form-data body that streams one file field from an mmap"""
+    def __init__(self, field_name: str, file_path: str, mm: mmap.mmap):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{os.path.basename(file_path)}"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self._view = memoryview(mm)
+        self._parts = [memoryview(head), self._view, memoryview(tail)]
+        self._length = sum(len(part) for part in self._parts)
+        self._part = 0
+        self._pos = 0
+        self._last_block = None  # memoryview terakhir yang diserahkan ke pemanggil
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1):
+        """Return the next block, as a zero-copy memoryview unless it spans two parts"""
+        # Pemanggil (http.client/urllib3) sudah mengirim blok sebelumnya sebelum read berikutnya
+        self._release_last_block()
+        if size is None or size < 0:
+            size = self._length
+        out = []
+        while size > 0 and self._part < len(self._parts):
+            part = self._parts[self._part]
+            block = part[self._pos:self._pos + size]
+            out.append(block)
+            size -= len(block)
+            self._pos += len(block)
+            if self._pos >= len(part):
+                self._part += 1
+                self._pos = 0
+        if len(out) == 1:
+            self._last_block = out[0]
+            return out[0]
+        return b''.join(out)
+
+    def _release_last_block(self):
+        """Release the previously returned memoryview block"""
+        if self._last_block is not None:
+            self._last_block.release()
+            self._last_block = None
+
+    def close(self):
+        """Release the mmap exports so the map can be closed"""
+        self._release_last_block()
+        self._view.release()
 
 class FacebookUploader:
     def __init__(self, page_config: Dict):
@@ -151,79 +524,107 @@ class FacebookUploader:
         self.access_token = page_config["access_token"]
         self.page_name = page_config["page_name"]
         self.api_version = "v20.0"
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': USER_AGENT})
+        self.session = GRAPH_SESSION
 
     def validate_token(self) -> bool:
-        """Validate the Facebook access token"""
+        """Validate the Facebook access token, reusing a recent successful check"""
+        cache_key = (self.page_id, self.access_token)
+        if time.time() - _TOKEN_CACHE.get(cache_key, 0) < TOKEN_CACHE_TTL:
+            return True
+        
         url = f"https://graph.facebook.com/{self.api_version}/{self.page_id}/video_reels"
         params = { 'since': 'today', 'access_token': self.access_token }
         try:
             response = self.session.get(url, params=params)
-            return response.status_code == 200
+            if response.status_code == 200:
+                _TOKEN_CACHE[cache_key] = time.time()
+                return True
+            return False
         except Exception as e:
             print(f"Token validation error: {e}")
             return False
 
-    def upload_to_all_pages(self, video_path: str, description: str, is_reel: bool = False) -> List[Dict]:
-        """Upload video to all configured pages"""
-        pages = FacebookPageManager.load_pages()
-        results = []
+    def _handle_http_error(self, error: requests.exceptions.HTTPError):
+        """Drop the cached token validation if Facebook rejected the token"""
+        response = error.response
+        if response is None:
+            return
         
-        for page in pages:
+        token_rejected = response.status_code in (401, 403)
+        if not token_rejected:
+            # Token kedaluwarsa/dicabut biasanya HTTP 400 dengan error code 190 (OAuthException)
             try:
-                print(f"\nPreparing upload to {page['page_name']}...")
-                
-                # Initialize uploader for this page
-                uploader = FacebookUploader(page)
-                
-                # Verify token
-                if not uploader.validate_token():
-                    print(f"Invalid token for {page['page_name']}")
-                    results.append({
-                        "page_name": page["page_name"],
-                        "status": "failed",
-                        "error": "Invalid access token"
-                    })
-                    continue
-                
-                # Upload based on video type
-                if is_reel:
-                    post_id = uploader._upload_reel(video_path, description)
-                else:
-                    post_id = uploader._upload_regular_video(video_path, description)
-                
-                if post_id:
-                    results.append({
-                        "page_name": page["page_name"],
-                        "post_id": post_id,
-                        "status": "success",
-                        "url": f"https://facebook.com/{post_id}"
-                    })
-                    print(f"Successfully uploaded to {page['page_name']}")
-                else:
-                    results.append({
-                        "page_name": page["page_name"],
-                        "status": "failed",
-                        "error": "Upload returned no post ID"
-                    })
-                
-                # Delay between page uploads
-                if page != pages[-1]:  # No delay after last upload
-                    print(f"Waiting {UPLOAD_DELAY} seconds before next upload...")
-                    time.sleep(UPLOAD_DELAY)
-                    
-            except Exception as e:
-                print(f"Error uploading to {page['page_name']}: {e}")
-                results.append({
-                    "page_name": page["page_name"],
-                    "status": "error",
-                    "error": str(e)
-                })
-                continue
-                
+                fb_error = response.json().get('error') or {}
+            except ValueError:
+                fb_error = {}
+            token_rejected = fb_error.get('code') == 190 or fb_error.get('type') == 'OAuthException'
+        
+        if token_rejected:
+            _TOKEN_CACHE.pop((self.page_id, self.access_token), None)
+
+    @staticmethod
+    def upload_to_all_pages(pages: List[Dict], video_path: str, description: str, is_reel: bool = False) -> List[Dict]:
+        """Upload video to the given pages concurrently"""
+        if not pages:
+            return []
+
+        # Setiap page adalah endpoint Graph API terpisah, jadi upload bisa paralel
+        with ThreadPoolExecutor(max_workers=min(len(pages), GRAPH_POOL_SIZE)) as executor:
+            futures = [
+                executor.submit(FacebookUploader._upload_one_page, page, video_path, description, is_reel)
+                for page in pages
+            ]
+            results = [future.result() for future in futures]
+
         return results
 
+    @staticmethod
+    def _upload_one_page(page: Dict, video_path: str, description: str, is_reel: bool) -> Dict:
+        """Upload video to a single page and return the result"""
+        try:
+            print(f"\nPreparing upload to {page['page_name']}...")
+
+            # Initialize uploader for this page
+            uploader = FacebookUploader(page)
+
+            # Verify token
+            if not uploader.validate_token():
+                print(f"Invalid token for {page['page_name']}")
+                return {
+                    "page_name": page["page_name"],
+                    "status": "failed",
+                    "error": "Invalid access token"
+                }
+
+            # Upload based on video type
+            if is_reel:
+                post_id = uploader._upload_reel(video_path, description)
+            else:
+                post_id = uploader._upload_regular_video(video_path, description)
+
+            if post_id:
+                print(f"Successfully uploaded to {page['page_name']}")
+                return {
+                    "page_name": page["page_name"],
+                    "post_id": post_id,
+                    "status": "success",
+                    "url": f"https://facebook.com/{post_id}"
+                }
+
+            return {
+                "page_name": page["page_name"],
+                "status": "failed",
+                "error": "Upload returned no post ID"
+            }
+
+        except Exception as e:
+            print(f"Error uploading to {page['page_name']}: {e}")
+            return {
+                "page_name": page["page_name"],
+                "status": "error",
+                "error": str(e)
+            }
+
     def _upload_reel(self, video_path: str, description: str) -> Optional[str]:
         """Upload a Reel to Facebook"""
         # Step 1: Initialize upload
@@ -243,17 +644,7 @@ class FacebookUploader:
                 raise Exception("No video ID received from Facebook")
 
             # Step 2: Upload video data
-            upload_url = f'https://rupload.facebook.com/video-upload/{self.api_version}/{video_id}'
-            headers = {
-                'Authorization': f'OAuth {self.access_token}',
-                'offset': '0',
-                'file_size': str(os.path.getsize(video_path)),
-                'Content-Type': 'application/octet-stream'
-            }
-            
-            with open(video_path, 'rb') as video_file:
-                upload_response = self.session.post(upload_url, data=video_file, headers=headers)
-                upload_response.raise_for_status()
+            self._upload_reel_chunks(video_id, video_path)
 
             # Step 3: Publish with Reels parameters
             publish_data = {
@@ -275,26 +666,101 @@ class FacebookUploader:
             return video_id
             
         except requests.exceptions.HTTPError as e:
+            self._handle_http_error(e)
             print(f"HTTP Error uploading Reel: {e.response.text}")
             return None
         except Exception as e:
             print(f"Error uploading Reel: {e}")
             return None
 
+    def _upload_reel_chunks(self, video_id: str, video_path: str):
+        """Upload Reel data in chunks, resuming from the server's offset on transient errors"""
+        upload_url = f'https://rupload.facebook.com/video-upload/{self.api_version}/{video_id}'
+        file_size = os.stat(video_path).st_size
+        if not file_size:
+            raise Exception("Video file is empty")
+        
+        # Chunk diambil langsung dari mmap tanpa salinan di userspace
+        with open(video_path, 'rb') as video_file, \
+                mmap.mmap(video_file.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            offset = 0
+            attempt = 0
+            while offset < file_size:
+                end = min(offset + UPLOAD_CHUNK_SIZE, file_size)
+                headers = {
+                    'Authorization': f'OAuth {self.access_token}',
+                    'offset': str(offset),
+                    'file_size': str(file_size),
+                    'Content-Length': str(end - offset),
+                    'Content-Type': 'application/octet-stream'
+                }
+                try:
+                    with view[offset:end] as chunk:
+                        upload_response = self.session.post(
+                            upload_url, data=chunk, headers=headers, timeout=UPLOAD_TIMEOUT
+                        )
+                    upload_response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    # Error 4xx (offset/token salah) permanen, langsung gagal
+                    if not self._is_transient_error(e):
+                        raise
+                    attempt += 1
+                    if attempt > MAX_RETRIES:
+                        raise
+                    print(f"Chunk at offset {offset} failed ({e}), retrying {attempt}/{MAX_RETRIES}...")
+                    time.sleep(2 ** attempt)
+                    # Lanjut dari jumlah byte yang benar-benar diterima server
+                    if (server_offset := self._get_uploaded_bytes(video_id)) is not None:
+                        offset = server_offset
+                    continue
+                offset = end
+                attempt = 0
+
+    @staticmethod
+    def _is_transient_error(error: requests.exceptions.RequestException) -> bool:
+        """Only connection problems and 5xx responses are worth retrying"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code >= 500
+        return isinstance(error, (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError
+        ))
+
+    def _get_uploaded_bytes(self, video_id: str) -> Optional[int]:
+        """Ask the Graph API how many bytes of the upload it has received"""
+        url = f"https://graph.facebook.com/{self.api_version}/{video_id}"
+        params = {'fields': 'status', 'access_token': self.access_token}
+        try:
+            response = self.session.get(url, params=params, timeout=UPLOAD_TIMEOUT)
+            response.raise_for_status()
+            uploading = response.json().get('status', {}).get('uploading_phase', {})
+            return int(uploading['bytes_transferred'])
+        except Exception as e:
+            print(f"Could not read upload status for {video_id}: {e}")
+            return None
+
     def _upload_regular_video(self, video_path: str, description: str) -> Optional[str]:
         """Upload a regular video to Facebook"""
         url = f"https://graph-video.facebook.com/{self.api_version}/{self.page_id}/videos"
         
         try:
-            with open(video_path, 'rb') as video_file:
-                files = {'source': video_file}
-                params = {
-                    'access_token': self.access_token,
-                    'description': description,
-                    'published': 'true'
-                }
-                
-                response = self.session.post(url, files=files, params=params)
+            params = {
+                'access_token': self.access_token,
+                'description': description,
+                'published': 'true'
+            }
+            
+            # Body multipart dibaca bertahap dari mmap, bukan dimuat penuh ke memori
+            with open(video_path, 'rb') as video_file, \
+                    mmap.mmap(video_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                body = MultipartFileStream('source', video_path, mm)
+                try:
+                    headers = {'Content-Type': body.content_type, 'Content-Length': str(len(body))}
+                    response = self.session.post(url, data=body, params=params, headers=headers)
+                finally:
+                    body.close()
                 response.raise_for_status()
                 
                 video_id = response.json().get('id')
@@ -302,6 +768,7 @@ class FacebookUploader:
                 return video_id
                 
         except requests.exceptions.HTTPError as e:
+            self._handle_http_error(e)
             print(f"HTTP Error uploading video: {e.response.text}")
             return None
         except Exception as e:
@@ -311,38 +778,109 @@ class FacebookUploader:
 class DetikScraper:
     def __init__(self):
         self.headers = {"User-Agent": USER_AGENT}
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': USER_AGENT})
+        self.session = DETIK_SESSION
+        # url -> {'etag', 'last_modified', 'text'} untuk conditional GET. Hanya berguna
+        # di mode loop: dengan --once (workflow) cache selalu kosong di awal proses.
+        self._http_cache: Dict[str, Dict] = {}
+        # Link hasil parse listing terakhir, dipakai ulang saat listing 304
+        self._video_links: List[str] = []
+
+    def _conditional_headers(self, url: str) -> Dict:
+        """Request headers with If-None-Match/If-Modified-Since for a known page"""
+        headers = dict(self.headers)
+        if cached := self._http_cache.get(url):
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def _remember(self, url: str, response_headers, text: Optional[str]):
+        """Store validators of a fresh response so the next fetch can get a 304"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if etag or last_modified:
+            self._http_cache[url] = {'etag': etag, 'last_modified': last_modified, 'text': text}
 
     def get_video_links(self) -> List[str]:
         """Get video links from Detik.com"""
         try:
-            response = self.session.get(BASE_URL, headers=self.headers)
+            response = self.session.get(BASE_URL, headers=self._conditional_headers(BASE_URL))
+            if response.status_code == 304:
+                # Parse dilewati, tapi link tetap dikembalikan agar upload yang gagal diulang
+                print("Video listing not modified since last check")
+                return list(self._video_links)
             response.raise_for_status()
+            self._remember(BASE_URL, response.headers, None)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, HTML_PARSER, parse_only=LISTING_STRAINER)
             video_links = []
+            seen = set()
             
-            # Cari semua link video di halaman
+            # Cari semua link video di halaman (urutan tampil = terbaru dulu)
             for article in soup.find_all("article", class_="list-content__item"):
                 if link := article.find("a", class_="block-link"):
                     if href := link.get("href"):
                         if "video" in href.lower():
                             full_url = urljoin(BASE_URL, href)
-                            video_links.append(full_url)
+                            if full_url not in seen:  # Hapus duplikat
+                                seen.add(full_url)
+                                video_links.append(full_url)
             
-            return list(set(video_links))  # Hapus duplikat
+            # Buang cache halaman yang sudah tidak ada di listing
+            keep = seen | {BASE_URL}
+            self._http_cache = {url: cached for url, cached in self._http_cache.items() if url in keep}
+            self._video_links = video_links
+            return list(video_links)
         except Exception as e:
             print(f"Scraping error: {e}")
             return []
 
-    def get_video_details(self, video_url: str) -> Optional[Dict]:
-        """Get details of a specific video"""
+    def fetch_pages(self, urls: List[str]) -> List[Optional[str]]:
+        """Fetch HTML of several pages concurrently, None for failed pages"""
+        if not urls:
+            return []
+        if aiohttp is None:
+            return [self._fetch_page(url) for url in urls]
+        return asyncio.run(self._fetch_all(urls))
+
+    def _fetch_page(self, url: str) -> Optional[str]:
+        """Fetch HTML of a single page with the blocking session"""
         try:
-            response = self.session.get(video_url, headers=self.headers)
+            response = self.session.get(url, headers=self._conditional_headers(url))
+            if response.status_code == 304:
+                return self._http_cache[url]['text']
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            self._remember(url, response.headers, response.text)
+            return response.text
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    async def _fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """Fetch all pages over one aiohttp session, preserving input order"""
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_FETCHES)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            return await asyncio.gather(*(self._fetch_async(session, url) for url in urls))
+
+    async def _fetch_async(self, session, url: str) -> Optional[str]:
+        """Fetch HTML of a single page with the aiohttp session"""
+        try:
+            async with session.get(url, headers=self._conditional_headers(url)) as response:
+                if response.status == 304:
+                    return self._http_cache[url]['text']
+                response.raise_for_status()
+                text = await response.text()
+                self._remember(url, response.headers, text)
+                return text
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    def parse_details(self, html: str, video_url: str) -> Optional[Dict]:
+        """Parse video details from an already fetched page"""
+        try:
+            soup = BeautifulSoup(html, HTML_PARSER, parse_only=DETAIL_STRAINER)
             
             # Ekstrak judul
             title_element = soup.find("h1", class_="detail__title") or soup.find("title")
@@ -370,7 +908,7 @@ class DetikScraper:
                 hashtags = " ".join(f"#{k.replace(' ', '')}" for k in keywords if k)
             
             # Ekstrak URL video
-            if not (video_url := self._extract_video_url(response.text)):
+            if not (media_url := self._extract_video_url(html)):
                 return None
             
             return {
@@ -378,7 +916,8 @@ class DetikScraper:
                 "description": description,
                 "duration": duration,
                 "keywords": hashtags,
-                "source_url": video_url,
+                "source_url": media_url,
+                "page_url": video_url,
                 "scraped_at": datetime.now().isoformat()
             }
         except Exception as e:
@@ -389,24 +928,24 @@ class DetikScraper:
         """Extract video URL from page content"""
         try:
             # Coba ekstrak dari JSON-LD
-            if script_ld := re.search(r'<script type="application/ld\+json">(.*?)</script>', html_content, re.DOTALL):
+            if 'application/ld+json' in html_content and (script_ld := JSONLD_RE.search(html_content)):
                 try:
-                    json_data = json.loads(script_ld.group(1))
+                    json_data = json_loads(script_ld.group(1))
                     if json_data.get("@type") == "VideoObject":
                         return json_data.get("contentUrl")
                 except json.JSONDecodeError:
                     pass
             
-            # Coba pola lainnya
-            patterns = [
-                r'videoUrl\s*:\s*["\'](.*?\.m3u8[^"\']*)["\']',
-                r'<meta[^>]*content=["\'](https?://[^"\']*\.mp4[^"\']*)["\']',
-                r'src:\s*["\'](https?://[^"\']*\.mp4[^"\']*)["\']'
-            ]
+            # Coba pola lainnya dalam satu kali scan
+            found = {}
+            for match in VIDEO_URL_RE.finditer(html_content):
+                group = match.lastgroup
+                found.setdefault(group, match.group(group))
+                if group == VIDEO_URL_GROUPS[0]:
+                    break
             
-            for pattern in patterns:
-                if match := re.search(pattern, html_content, re.IGNORECASE):
-                    url = match.group(1)
+            for group in VIDEO_URL_GROUPS:
+                if url := found.get(group):
                     if url.startswith('//'):
                         url = 'https:' + url
                     return url
@@ -416,7 +955,177 @@ class DetikScraper:
             print(f"URL extraction error: {e}")
             return None
 
-def main():
+def publish_video(video_manager: VideoManager, fb_pages: List[Dict], details: Dict, video_path: str, is_reel: bool) -> bool:
+    """Upload one prepared video to all pages and record the result"""
+    try:
+        # Siapkan deskripsi
+        description = (
+            #f"{details['title']}\n\n"
+            f"{details['description']}\n\n"
+            f"{details['keywords']}"
+            #f"Sumber: {link}"
+        )
+        
+        # Upload ke semua halaman
+        print("\nStarting upload to all pages...")
+        upload_results = FacebookUploader.upload_to_all_pages(
+            fb_pages,
+            video_path,
+            description,
+            is_reel
+        )
+        
+        # Catat hasil upload
+        success_count = sum(1 for r in upload_results if r['status'] == 'success')
+        if success_count > 0:
+            details["posted_to"] = upload_results
+            video_manager.add_posted_video(details)
+            print(f"\nSuccessfully uploaded to {success_count} page(s)")
+        else:
+            print("\nFailed to upload to all pages")
+        
+        # Hapus file video setelah upload
+        try:
+            os.remove(video_path)
+            print("Cleaned up video file")
+        except Exception as e:
+            print(f"Error cleaning up video file: {e}")
+        
+        # Log hasil
+        print("\nUpload results:")
+        for result in upload_results:
+            status = "✅" if result['status'] == 'success' else "❌"
+            print(f"{status} {result['page_name']}: {result.get('url', 'Failed')}")
+            if 'error' in result:
+                print(f"   Error: {result['error']}")
+        
+        return success_count > 0
+    
+    except Exception as e:
+        print(f"\nError processing video: {e}")
+        return False
+
+def run_once(video_manager: VideoManager, scraper: DetikScraper, fb_pages: List[Dict]) -> int:
+    """Run a single scrape-and-upload cycle, returning the number of new videos"""
+    print("\n" + "="*50)
+    print(f"[{datetime.now()}] Checking for new videos...")
+    
+    # Dapatkan link video
+    video_links = scraper.get_video_links()
+    if not video_links:
+        print("No videos found")
+        return 0
+    
+    print(f"Found {len(video_links)} video links")
+    
+    # Cek apakah video sudah diupload sebelumnya
+    new_links = []
+    for link in video_links:
+        if video_manager.is_video_posted(link):
+            print(f"\nSkipping already posted video: {link}")
+        else:
+            new_links.append(link)
+    
+    # Ambil semua halaman detail secara paralel
+    pages_html = scraper.fetch_pages(new_links)
+    
+    # Ambil detail dan download semua video baru
+    # (details, path, is_reel, needs_conversion) dalam urutan listing (terbaru dulu)
+    items = []
+    queued_hashes = set()  # Hash konten yang sudah antre di siklus ini
+    for link, html in zip(new_links, pages_html):
+        try:
+            print(f"\nProcessing new video: {link}")
+            
+            # Dapatkan detail video
+            details = scraper.parse_details(html, link) if html else None
+            if not details:
+                print("Failed to get video details, skipping...")
+                continue
+            
+            print(f"Title: {details['title']}")
+            print(f"Duration: {details['duration']} seconds")
+            
+            # Tentukan jenis video (Reel atau regular)
+            is_reel = details['duration'] <= 60
+            video_path = original_path = None
+            if is_reel:
+                print("Video is short (<= 60s), downloading straight to Reel format...")
+                if not (video_path := VideoProcessor.download_video(details['source_url'], as_reel=True)):
+                    print("Direct Reel download failed, falling back to download + convert...")
+            
+            if not video_path:
+                # Download video
+                print("Downloading video...")
+                if not (original_path := VideoProcessor.download_video(details['source_url'])):
+                    print("Failed to download video, skipping...")
+                    continue
+                video_path = original_path
+            
+            # Cek duplikat berdasarkan isi file. Hash diberi jenis agar hanya dibandingkan
+            # dengan hash sejenis: file sumber, atau hasil encode Reel langsung (yang
+            # bergantung pada encoder, jadi hanya cocok dengan encoder yang sama).
+            if original_path:
+                hash_kind = 'source'
+            else:
+                hash_kind = f"reel-{VideoProcessor.get_encoder()['name']}"
+            content_hash = f"{hash_kind}:{VideoProcessor.compute_file_hash(video_path)}"
+            if video_manager.is_content_posted(content_hash) or content_hash in queued_hashes:
+                print("Same video content already posted under another URL, skipping...")
+                os.remove(video_path)
+                continue
+            details['content_hash'] = content_hash
+            queued_hashes.add(content_hash)
+            
+            # Reel yang di-download biasa masih perlu dikonversi
+            items.append((details, video_path, is_reel, is_reel and bool(original_path)))
+        
+        except Exception as e:
+            print(f"\nError processing video: {e}")
+            continue
+    
+    reel_items = [(details, path) for details, path, _, needs_conversion in items if needs_conversion]
+    
+    new_videos = 0
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CONVERSIONS) as executor:
+        # Konversi Reel di background, dibagi ke beberapa proses FFmpeg
+        conversions = {}  # original path -> (future batch, posisi di batch)
+        if reel_items:
+            print(f"\nConverting {len(reel_items)} short video(s) (<= 60s) to Reel format...")
+            workers = min(MAX_PARALLEL_CONVERSIONS, len(reel_items))
+            for group in (reel_items[i::workers] for i in range(workers)):
+                paths = [path for _, path in group]
+                future = executor.submit(VideoProcessor.convert_batch_to_reel_format, paths)
+                for position, path in enumerate(paths):
+                    conversions[path] = (future, position)
+        
+        # Upload tetap dalam urutan listing; hanya menunggu konversi item yang sedang diproses
+        for details, path, is_reel, needs_conversion in items:
+            print(f"\nUploading: {details['title']}")
+            if needs_conversion:
+                future, position = conversions[path]
+                try:
+                    video_path = future.result()[position]
+                except Exception as e:
+                    print(f"Error in video conversion: {e}")
+                    video_path = None
+                try:
+                    os.remove(path)  # Hapus file original
+                except Exception as e:
+                    print(f"Error cleaning up original file: {e}")
+                if not video_path:
+                    continue
+            else:
+                video_path = path
+                if not is_reel:
+                    print("Video is long (> 60s), uploading as regular video...")
+            
+            if publish_video(video_manager, fb_pages, details, video_path, is_reel):
+                new_videos += 1
+
+    return new_videos
+
+def main(once: bool = False):
     """Main function to run the scraper and uploader"""
     try:
         print("\n" + "="*50)
@@ -441,105 +1150,18 @@ def main():
             print(f"Error loading Facebook pages: {e}")
             return
 
+        # Mode sekali jalan untuk cron/systemd timer, contoh crontab:
+        #   0 */2 * * * cd /path/to/Detik && python 20detik.py --once
+        if once:
+            new_videos = run_once(video_manager, scraper, fb_pages)
+            print(f"\nRun completed. {new_videos} new videos processed.")
+            return
+
         while True:
             try:
-                print("\n" + "="*50)
-                print(f"[{datetime.now()}] Checking for new videos...")
-                
-                # Dapatkan link video
-                video_links = scraper.get_video_links()
-                if not video_links:
-                    print("No videos found, waiting for next check...")
-                    time.sleep(CHECK_INTERVAL)
-                    continue
-                
-                print(f"Found {len(video_links)} video links")
-                
-                new_videos = 0
-                for link in video_links:
-                    try:
-                        # Cek apakah video sudah diupload sebelumnya
-                        if video_manager.is_video_posted(link):
-                            print(f"\nSkipping already posted video: {link}")
-                            continue
-                        
-                        print(f"\nProcessing new video: {link}")
-                        
-                        # Dapatkan detail video
-                        details = scraper.get_video_details(link)
-                        if not details:
-                            print("Failed to get video details, skipping...")
-                            continue
-                        
-                        print(f"Title: {details['title']}")
-                        print(f"Duration: {details['duration']} seconds")
-                        
-                        # Download video
-                        print("Downloading video...")
-                        original_path = VideoProcessor.download_video(details['source_url'])
-                        if not original_path:
-                            print("Failed to download video, skipping...")
-                            continue
-                        
-                        # Tentukan jenis video (Reel atau regular)
-                        is_reel = details['duration'] <= 60
-                        if is_reel:
-                            print("Video is short (<= 60s), converting to Reel format...")
-                            video_path = VideoProcessor.convert_to_reel_format(original_path)
-                            os.remove(original_path)  # Hapus file original
-                            if not video_path:
-                                continue
-                        else:
-                            video_path = original_path
-                            print("Video is long (> 60s), uploading as regular video...")
-                        
-                        # Siapkan deskripsi
-                        description = (
-                            #f"{details['title']}\n\n"
-                            f"{details['description']}\n\n"
-                            f"{details['keywords']}"
-                            #f"Sumber: {link}"
-                        )
-                        
-                        # Upload ke semua halaman
-                        print("\nStarting upload to all pages...")
-                        # Use the first page config just to initialize the uploader
-                        uploader = FacebookUploader(fb_pages[0])
-                        upload_results = uploader.upload_to_all_pages(
-                            video_path,
-                            description,
-                            is_reel
-                        )
-                        
-                        # Catat hasil upload
-                        success_count = sum(1 for r in upload_results if r['status'] == 'success')
-                        if success_count > 0:
-                            details["posted_to"] = upload_results
-                            video_manager.add_posted_video(details)
-                            new_videos += 1
-                            print(f"\nSuccessfully uploaded to {success_count} page(s)")
-                        else:
-                            print("\nFailed to upload to all pages")
-                        
-                        # Hapus file video setelah upload
-                        try:
-                            os.remove(video_path)
-                            print("Cleaned up video file")
-                        except Exception as e:
-                            print(f"Error cleaning up video file: {e}")
-                        
-                        # Log hasil
-                        print("\nUpload results:")
-                        for result in upload_results:
-                            status = "✅" if result['status'] == 'success' else "❌"
-                            print(f"{status} {result['page_name']}: {result.get('url', 'Failed')}")
-                            if 'error' in result:
-                                print(f"   Error: {result['error']}")
-                    
-                    except Exception as e:
-                        print(f"\nError processing video: {e}")
-                        continue
-                
+                # Reload hanya jika facebook_pages.json berubah sejak load terakhir
+                fb_pages = FacebookPageManager.load_pages()
+                new_videos = run_once(video_manager, scraper, fb_pages)
                 print(f"\nCycle completed. {new_videos} new videos processed.")
                 print(f"Next check in {CHECK_INTERVAL//60} minutes...")
                 time.sleep(CHECK_INTERVAL)
@@ -557,5 +1179,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
-                  
+    parser = argparse.ArgumentParser(description="Detik.com to Facebook Multi-Page Uploader")
+    parser.add_argument('--once', action='store_true', help="Run a single cycle and exit (for cron/scheduled runs)")
+    args = parser.parse_args()
+    main(once=args.once)